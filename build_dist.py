@@ -8,7 +8,7 @@ available in the built distribution.
 Usage:
   - Place your swift_alliance_bank.py, swift_messages.py, swift_alliance_gui.py, swift_iso_validator.py, etc. in the project root.
   - Place the SWIFT logo file (swift_logo.png or swift_logo.svg) into ./assets/ (ensure you have rights).
-  - Install pyinstaller: pip install pyinstaller
+  - Install pyinstaller: pip install "pyinstaller>=6.6"
   - Run: python build_dist.py
 
 Security / legal reminder:
@@ -24,14 +24,141 @@ APP_NAME = "swift_alliance_gui"
 ENTRY_SCRIPT = "swift_alliance_gui.py"
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
 LOGO_FILENAMES = ["swift_logo.png", "swift_logo.svg", "swift_logo.jpg"]
+LOGO_CACHE_DIR = os.path.join(ASSETS_DIR, ".cache")  # same location the GUI reads rasterized SVGs from
+LOGO_PREVIEW_SIZE = (220, 80)  # fixed size of logo_label in swift_alliance_gui.ui
+QRC_FILE = os.path.join(os.path.dirname(__file__), "assets.qrc")
+RC_MODULE = os.path.join(os.path.dirname(__file__), "assets_rc.py")
+UI_FILE = os.path.join(os.path.dirname(__file__), "swift_alliance_gui.ui")
+UI_MODULE = os.path.join(os.path.dirname(__file__), "ui_swift_alliance_gui.py")
+
+# Modules PyInstaller would otherwise pull into the bundle but the GUI never uses.
+# Keeping them out shrinks the dist and the archive the bootloader unpacks at launch.
+# (--exclude-module takes exact names, so Qt module families are listed explicitly.)
+EXCLUDE_MODULES = [
+    "tkinter",
+    "PyQt5.QtWebEngine",
+    "PyQt5.QtWebEngineCore",
+    "PyQt5.QtWebEngineWidgets",
+    "PyQt5.QtQuick",
+    "PyQt5.QtQml",
+    "PyQt5.QtMultimedia",
+    "PyQt5.Qt3DCore",
+    "PyQt5.Qt3DRender",
+    "PyQt5.Qt3DInput",
+    "PyQt5.Qt3DLogic",
+    "PyQt5.Qt3DExtras",
+    "PyQt5.Qt3DAnimation",
+    "PyQt5.QtBluetooth",
+    "PyQt5.QtSerialPort",
+    "PyQt5.QtSql",
+    "PyQt5.uic",  # runtime .ui fallback; the bundle imports the pyuic5-compiled form
+    "unittest",
+    "pydoc",
+    "xmlrpc",
+    "test",
+    "pytest",
+]
+
+def _asset_names():
+    """Names of the entries in assets/, read with a single directory scan."""
+    try:
+        with os.scandir(ASSETS_DIR) as it:
+            return {e.name for e in it}
+    except FileNotFoundError:
+        return set()
 
 def find_logo():
+    names = _asset_names()
     for fname in LOGO_FILENAMES:
-        path = os.path.join(ASSETS_DIR, fname)
-        if os.path.exists(path):
-            return path
+        if fname in names:
+            return os.path.join(ASSETS_DIR, fname)
     return None
 
+def render_logo_cache():
+    """
+    Rasterize assets/swift_logo.svg into assets/.cache/swift_logo.svg.png at the GUI's preview
+    size, so the dist ships the PNG the GUI looks for and never runs QSvgRenderer at launch.
+    """
+    if "swift_logo.svg" not in _asset_names():
+        return
+    try:
+        from PyQt5 import QtCore, QtGui
+        from PyQt5.QtSvg import QSvgRenderer
+    except ImportError:
+        print("PyQt5.QtSvg not available; skipping logo pre-rendering.")
+        return
+
+    svg_path = os.path.join(ASSETS_DIR, "swift_logo.svg")
+    png_path = os.path.join(LOGO_CACHE_DIR, "swift_logo.svg.png")
+    # QPainter needs a GUI application (fonts); offscreen so the build runs headless
+    app = QtGui.QGuiApplication.instance() or QtGui.QGuiApplication([sys.argv[0], "-platform", "offscreen"])  # noqa: F841
+    image = QtGui.QImage(*LOGO_PREVIEW_SIZE, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.transparent)
+    renderer = QSvgRenderer(svg_path)
+    if not renderer.isValid():
+        print(f"Could not parse {svg_path}; skipping logo pre-rendering.")
+        return
+    painter = QtGui.QPainter(image)
+    renderer.render(painter)
+    painter.end()
+    os.makedirs(LOGO_CACHE_DIR, exist_ok=True)
+    if image.save(png_path, "PNG"):
+        print(f"Pre-rendered logo: {png_path}")
+    else:
+        print(f"Failed to write {png_path}")
+
+def compile_resources():
+    """
+    Embed the logo from assets/ into a compiled Qt resource module (assets_rc.py).
+    The GUI imports assets_rc when present and loads the logo from ":/assets/..." out of
+    the bundled module instead of opening files on disk. An SVG logo is embedded as the PNG
+    render_logo_cache() made of it, so the frozen app never runs QSvgRenderer at launch.
+    """
+    # Never bundle a module left over from an earlier build (other logo, or pyrcc5 failing now)
+    try:
+        os.remove(RC_MODULE)
+    except FileNotFoundError:
+        pass
+
+    logo = find_logo()
+    if logo is None:
+        print("No logo to embed; skipping Qt resource compilation.")
+        return
+    src = os.path.relpath(logo, os.path.dirname(QRC_FILE))
+    if logo.endswith(".svg"):
+        rendered = os.path.join(LOGO_CACHE_DIR, "swift_logo.svg.png")
+        if not os.path.exists(rendered):
+            print("SVG logo has no pre-rendered PNG; skipping Qt resource compilation.")
+            return
+        src = os.path.relpath(rendered, os.path.dirname(QRC_FILE))
+        alias = "swift_logo.png"
+    else:
+        alias = os.path.basename(logo)
+
+    with open(QRC_FILE, "w", encoding="utf-8") as f:
+        f.write('<!DOCTYPE RCC><RCC version="1.0">\n<qresource prefix="/assets">\n'
+                f'    <file alias="{alias}">{src.replace(os.sep, "/")}</file>\n</qresource>\n</RCC>\n')
+
+    print("Compiling Qt resources...")
+    ret = subprocess.call([sys.executable, "-m", "PyQt5.pyrcc_main", QRC_FILE, "-o", RC_MODULE])
+    if ret != 0:
+        print("pyrcc5 failed; the GUI will load the logo from assets/ on disk.")
+        try:
+            os.remove(RC_MODULE)  # don't ship a partially written module
+        except FileNotFoundError:
+            pass
+
+def compile_ui():
+    """
+    Compile the Qt Designer form into ui_swift_alliance_gui.py so the frozen app runs the
+    generated setupUi() instead of parsing the .ui file at startup.
+    """
+    print("Compiling Qt Designer form...")
+    ret = subprocess.call([sys.executable, "-m", "PyQt5.uic.pyuic", UI_FILE, "-o", UI_MODULE])
+    if ret != 0:
+        print("pyuic5 failed; the GUI form could not be compiled.")
+        sys.exit(ret)
+
 def build_with_pyinstaller():
     # Ensure pyinstaller is available
     try:
@@ -46,7 +173,9 @@ def build_with_pyinstaller():
     else:
         print(f"Found logo: {logo_path}")
 
-    # Build args: one-folder build so assets are local alongside executable
+    # Build args: one-folder build so assets are local alongside executable.
+    # assets/.cache (the PNG render_logo_cache() made from the SVG logo) ships with the
+    # rest of assets/ so the first launch of the dist can skip SVG rendering too.
     add_data = f"{ASSETS_DIR}{os.pathsep}assets"
     args = [
         "pyinstaller",
@@ -54,8 +183,15 @@ def build_with_pyinstaller():
         "--name", APP_NAME,
         "--onedir",
         "--add-data", add_data,
-        ENTRY_SCRIPT
+        # Bytecode-compile bundled modules at -OO level: no docstrings in the PYZ
+        # (nothing in this project reads __doc__ or relies on assert)
+        "--optimize", "2",
     ]
+    if sys.platform != "win32":
+        args.append("--strip")  # strip symbol tables from bundled shared libraries
+    for mod in EXCLUDE_MODULES:
+        args += ["--exclude-module", mod]
+    args.append(ENTRY_SCRIPT)
 
     print("Running PyInstaller...")
     ret = subprocess.call(args)
@@ -71,8 +207,8 @@ def extract_logo_to_dist():
         print("No logo to extract; skipping extraction step.")
         return
 
-    # expected pyinstaller dist folder
-    dist_assets = os.path.join("dist", APP_NAME, "assets")
+    # PyInstaller >= 6 puts --add-data files under dist/<app>/_internal/
+    dist_assets = os.path.join("dist", APP_NAME, "_internal", "assets")
     if not os.path.exists(dist_assets):
         print("Dist assets folder not found; build may have failed or different layout used.")
         return
@@ -80,12 +216,15 @@ def extract_logo_to_dist():
     # copy logo to dist root for easy access (also kept in assets)
     dst = os.path.join("dist", APP_NAME, os.path.basename(logo_path))
     try:
-        shutil.copy2(logo_path, dst)
+        shutil.copyfile(logo_path, dst)
         print(f"Copied logo to: {dst}")
     except Exception as e:
         print(f"Failed to copy logo to dist: {e}")
 
 def main():
+    render_logo_cache()
+    compile_resources()
+    compile_ui()
     build_with_pyinstaller()
     extract_logo_to_dist()
     print("Build helper finished. Please verify the distribution and contained assets.")
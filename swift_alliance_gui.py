@@ -13,178 +13,199 @@ Features added:
 import sys
 import os
 import datetime
-import tempfile
-from decimal import Decimal
+import io
+import shutil
+import threading
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from typing import Optional
 from PyQt5 import QtWidgets, QtCore, QtGui
 
 from swift_alliance_bank import create_bank_instance  # keep your banking backend file in same dir
 from swift_messages import generate_mt103, generate_pain001, payment_from_transaction
-from swift_iso_validator import validate_pain001_generated, validate_mt103_text, SchemaNotFoundError
+from swift_iso_validator import (validate_pain001_generated, validate_mt103_text, load_pain001_schema,
+                                 parse_pain001_xml, SchemaNotFoundError, SchemaLoadError)
 
-# Optional: paramiko for SFTP (only used when configured)
+# Compiled Qt resources (assets_rc.py is generated by build_dist.py via pyrcc5)
 try:
-    import paramiko
-    HAS_PARAMIKO = True
-except Exception:
-    HAS_PARAMIKO = False
+    import assets_rc  # noqa: F401
+except ImportError:
+    pass
+
+# Optional: paramiko for SFTP (imported on first upload; it pulls in cryptography)
+_PARAMIKO = None
+
+
+def _load_paramiko():
+    """Import paramiko on first use; return None if it is not installed."""
+    global _PARAMIKO
+    if _PARAMIKO is None:
+        try:
+            import paramiko
+        except Exception:
+            return None
+        _PARAMIKO = paramiko
+    return _PARAMIKO
+
+
+def _write_text_file(path: str, content: str, chunk_size: int = 65536):
+    """Write text in chunks so a large message is never encoded to bytes all at once."""
+    with open(path, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+        for i in range(0, len(content), chunk_size):
+            f.write(content[i:i + chunk_size])
+
+
+@lru_cache(maxsize=4)
+def _cached_schema(path: str, mtime: float):
+    """Parsed pain.001 XSD; keyed on mtime so an edited file is re-parsed."""
+    return load_pain001_schema(path)
+
+
+@lru_cache(maxsize=1)
+def _load_svg_renderer():
+    """Return the QSvgRenderer class, or None if PyQt5.QtSvg is unavailable."""
+    try:
+        from PyQt5.QtSvg import QSvgRenderer
+    except Exception:
+        return None
+    return QSvgRenderer
 
 
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
-DEFAULT_LOGO_PATH = os.path.join(ASSETS_DIR, "swift_logo.svg")  # placeholder; replace with official file if permitted
+UI_FILE = os.path.join(os.path.dirname(__file__), "swift_alliance_gui.ui")
+
+# Main window form: pyuic5-compiled module in builds, compiled from the .ui at runtime otherwise
+try:
+    from ui_swift_alliance_gui import Ui_SwiftGUI
+except ImportError:
+    from PyQt5 import uic
+    Ui_SwiftGUI, _ = uic.loadUiType(UI_FILE)
+
+LOGO_FILENAMES = ["swift_logo.png", "swift_logo.svg", "swift_logo.jpg"]
+
 
+def _default_logo_path() -> str:
+    """Prefer a logo embedded in the Qt resources; fall back to the assets/ placeholder."""
+    for fname in LOGO_FILENAMES:
+        res_path = f":/assets/{fname}"
+        if QtCore.QFile.exists(res_path):
+            return res_path
+    return os.path.join(ASSETS_DIR, "swift_logo.svg")  # placeholder; replace with official file if permitted
 
-class SwiftGUI(QtWidgets.QMainWindow):
+
+DEFAULT_LOGO_PATH = _default_logo_path()
+LOGO_CACHE_DIR = os.path.join(ASSETS_DIR, ".cache")  # rasterized SVG logos (PNG)
+
+
+class SwiftGUI(QtWidgets.QMainWindow, Ui_SwiftGUI):
     def __init__(self):
         super().__init__()
-        self.bank = create_bank_instance()
-        self.setWindowTitle("Swift Alliance - Message Converter & Validator")
-        self.resize(980, 700)
+        self.bank = None  # created in the background once the window is up (_init_backend)
+        self._backend_failed = False  # last backend load raised; Refresh retries it
         self.schema_path: Optional[str] = None  # pain.001 XSD path
         self.last_validation_result = {"valid": False, "errors": []}
+        self._amount_decimal: Optional[Decimal] = None  # kept in sync with amount_edit
+        self._preview_doc = None  # parsed preview XML; reset whenever the preview text changes
+        # Authenticated SMTP / SFTP sessions kept between sends: (key, ...) with key = (host, port, user)
+        self._smtp = None
+        self._sftp = None
+        self._conn_lock = threading.Lock()
+        self._close_pending = False  # disconnect requested while a send held _conn_lock
         self._build_ui()
-
-    def _build_ui(self):
-        central = QtWidgets.QWidget()
-        self.setCentralWidget(central)
-        main_layout = QtWidgets.QVBoxLayout(central)
-
-        # Top: account selection + logo display
-        top_h = QtWidgets.QHBoxLayout()
-        main_layout.addLayout(top_h)
-
-        # Account selection
-        acct_layout = QtWidgets.QHBoxLayout()
-        top_h.addLayout(acct_layout)
-        acct_layout.addWidget(QtWidgets.QLabel("Select Account:"))
-        self.account_combo = QtWidgets.QComboBox()
-        acct_layout.addWidget(self.account_combo)
-        refresh_btn = QtWidgets.QPushButton("Refresh")
-        refresh_btn.clicked.connect(self._load_accounts)
-        acct_layout.addWidget(refresh_btn)
+        QtCore.QTimer.singleShot(0, self._init_backend)
+
+    def _init_backend(self):
+        """Construct the banking backend on the thread pool so it doesn't block the first paint."""
+        self._backend_failed = False
+        worker = Worker(create_bank_instance)
+        worker.signals.result.connect(self._on_backend_ready)
+        worker.signals.finished.connect(self._on_backend_finished)
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _on_backend_ready(self, bank):
+        self.bank = bank
         self._load_accounts()
 
-        # Logo display (right side)
-        logo_layout = QtWidgets.QVBoxLayout()
-        top_h.addLayout(logo_layout)
-        logo_layout.addStretch()
-        self.logo_label = QtWidgets.QLabel()
-        self.logo_label.setFixedSize(220, 80)
-        self.logo_label.setFrameShape(QtWidgets.QFrame.Box)
-        self.logo_label.setAlignment(QtCore.Qt.AlignCenter)
-        logo_layout.addWidget(self.logo_label)
-        load_logo_btn = QtWidgets.QPushButton("Load Logo")
-        load_logo_btn.clicked.connect(self.on_load_logo)
-        logo_layout.addWidget(load_logo_btn)
-        logo_layout.addStretch()
-        self._load_logo_preview(DEFAULT_LOGO_PATH)
+    def _on_backend_finished(self, ok: bool, error: str):
+        if not ok:
+            self._backend_failed = True
+            self.account_combo.clear()
+            self.account_combo.addItem("Error loading accounts", None)
+            self.status.showMessage(f"Failed to load bank backend: {error}", 8000)
 
-        # Form area (left)
-        form = QtWidgets.QFormLayout()
-        main_layout.addLayout(form)
-
-        self.ordering_name = QtWidgets.QLineEdit()
-        self.ordering_account = QtWidgets.QLineEdit()
-        self.beneficiary_name = QtWidgets.QLineEdit()
-        self.beneficiary_account = QtWidgets.QLineEdit()
-        self.beneficiary_bic = QtWidgets.QLineEdit()
-        self.amount_edit = QtWidgets.QLineEdit()
-        self.currency_edit = QtWidgets.QLineEdit("USD")
-        self.value_date = QtWidgets.QLineEdit(datetime.date.today().isoformat())
-        self.remittance = QtWidgets.QPlainTextEdit()
-        self.reference_edit = QtWidgets.QLineEdit()
-
-        form.addRow("Ordering Name:", self.ordering_name)
-        form.addRow("Ordering Account (IBAN):", self.ordering_account)
-        form.addRow("Beneficiary Name:", self.beneficiary_name)
-        form.addRow("Beneficiary Account (IBAN):", self.beneficiary_account)
-        form.addRow("Beneficiary BIC (optional):", self.beneficiary_bic)
-        form.addRow("Amount:", self.amount_edit)
-        form.addRow("Currency:", self.currency_edit)
-        form.addRow("Value Date (YYYY-MM-DD):", self.value_date)
-        form.addRow("Remittance Info:", self.remittance)
-        form.addRow("Reference (optional):", self.reference_edit)
-
-        # Format selection and schema selection
-        opts_layout = QtWidgets.QHBoxLayout()
-        main_layout.addLayout(opts_layout)
-
-        self.format_group = QtWidgets.QButtonGroup(self)
-        rb_mt = QtWidgets.QRadioButton("MT103 (text)")
-        rb_xml = QtWidgets.QRadioButton("ISO20022 pain.001 (XML)")
-        rb_xml.setChecked(True)
-        self.format_group.addButton(rb_mt, 0)
-        self.format_group.addButton(rb_xml, 1)
-        opts_layout.addWidget(QtWidgets.QLabel("Message Format:"))
-        opts_layout.addWidget(rb_mt)
-        opts_layout.addWidget(rb_xml)
-
-        # Schema selector for ISO20022
-        self.schema_label = QtWidgets.QLabel("No schema selected")
-        self.schema_select_btn = QtWidgets.QPushButton("Select pain.001 XSD")
+    def _build_ui(self):
+        # Widget tree comes from swift_alliance_gui.ui (compiled by pyuic5 in build_dist.py)
+        self.setupUi(self)
+        self.value_date.setText(datetime.date.today().isoformat())
+        self.format_group.setId(self.rb_mt, 0)
+        self.format_group.setId(self.rb_xml, 1)
+        amount_validator = QtGui.QDoubleValidator(0.0, 1e15, 2, self)
+        amount_validator.setNotation(QtGui.QDoubleValidator.StandardNotation)
+        # '.' decimal separator and no group separators, so every accepted text parses as a Decimal
+        amount_locale = QtCore.QLocale.c()
+        amount_locale.setNumberOptions(QtCore.QLocale.RejectGroupSeparator)
+        amount_validator.setLocale(amount_locale)
+        self.amount_edit.setValidator(amount_validator)
+        self.amount_edit.textChanged.connect(self._on_amount_changed)
+
+        self.refresh_btn.clicked.connect(self._load_accounts)
+        self.load_logo_btn.clicked.connect(self.on_load_logo)
         self.schema_select_btn.clicked.connect(self.select_schema_file)
-        opts_layout.addWidget(self.schema_label)
-        opts_layout.addWidget(self.schema_select_btn)
-
-        # Buttons row: generate / validate / save / send
-        btn_row = QtWidgets.QHBoxLayout()
-        main_layout.addLayout(btn_row)
-
-        self.btn_generate = QtWidgets.QPushButton("Generate Preview")
         self.btn_generate.clicked.connect(self.on_generate)
-        self.btn_validate = QtWidgets.QPushButton("Validate Now")
         self.btn_validate.clicked.connect(self.on_validate_clicked)
-        self.btn_save = QtWidgets.QPushButton("Save Message")
         self.btn_save.clicked.connect(self.on_save)
-        self.btn_send = QtWidgets.QPushButton("Send (mock)")
         self.btn_send.clicked.connect(self.on_send)
+        self.action_disconnect.triggered.connect(self.on_disconnect)
 
-        btn_row.addWidget(self.btn_generate)
-        btn_row.addWidget(self.btn_validate)
-        btn_row.addWidget(self.btn_save)
-        btn_row.addWidget(self.btn_send)
-
-        # Splitter: preview and validation results
-        splitter = QtWidgets.QSplitter(QtCore.Qt.Vertical)
-        main_layout.addWidget(splitter, stretch=1)
-
-        # Preview pane (top)
-        self.preview = QtWidgets.QPlainTextEdit()
-        self.preview.setReadOnly(True)
-        splitter.addWidget(self.preview)
-
-        # Validation results pane (bottom)
-        val_widget = QtWidgets.QWidget()
-        val_layout = QtWidgets.QVBoxLayout(val_widget)
-        splitter.addWidget(val_widget)
-
-        self.validation_status_label = QtWidgets.QLabel("Validation status: Not validated")
-        self.validation_status_label.setStyleSheet("font-weight: bold;")
-        val_layout.addWidget(self.validation_status_label)
-
-        self.validation_list = QtWidgets.QPlainTextEdit()
-        self.validation_list.setReadOnly(True)
-        val_layout.addWidget(self.validation_list)
-
-        # Status bar
-        self.status = QtWidgets.QStatusBar()
-        self.setStatusBar(self.status)
+        self._load_accounts()
+        self._load_logo_preview(DEFAULT_LOGO_PATH)
 
         # Hook account selection to populate ordering fields
         self.account_combo.currentIndexChanged.connect(self.on_account_changed)
+        self.preview.textChanged.connect(self._on_preview_changed)
+
+        # Debounced auto-validation: on_generate restarts the timer, _do_validate runs once it fires
+        self._pending_format = None
+        self._validate_timer = QtCore.QTimer(self)
+        self._validate_timer.setSingleShot(True)
+        self._validate_timer.setInterval(300)
+        self._validate_timer.timeout.connect(self._do_validate)
+
+        # Keep an idle SMTP session from timing out server-side
+        self._keepalive_timer = QtCore.QTimer(self)
+        self._keepalive_timer.setInterval(60000)
+        self._keepalive_timer.timeout.connect(self._keepalive)
+        self._keepalive_timer.start()
 
     def _load_accounts(self):
-        self.account_combo.clear()
+        # Populate in one batch with signals blocked so Qt doesn't cascade per-item updates
+        combo = self.account_combo
+        if self.bank is None:
+            if self._backend_failed:
+                self._init_backend()  # Refresh after a failed load: try again
+            combo.clear()
+            combo.addItem("Loading…", None)
+            combo.setEnabled(False)
+            return
+        combo.setEnabled(True)
+        combo.blockSignals(True)
         try:
+            combo.clear()
             accounts = list(self.bank.accounts.values())
             if not accounts:
-                self.account_combo.addItem("No accounts available", None)
-                return
-            for acc in accounts:
-                label = f"{acc.account_number} — {acc.account_type.value} — {acc.balance:.2f} {acc.currency.value}"
-                self.account_combo.addItem(label, acc.account_number)
+                combo.addItem("No accounts available", None)
+            else:
+                combo.addItems([f"{a.account_number} — {a.account_type.value} — {a.balance:.2f} {a.currency.value}"
+                                for a in accounts])
+                for i, a in enumerate(accounts):
+                    combo.setItemData(i, a.account_number)
         except Exception:
-            self.account_combo.addItem("Error loading accounts", None)
+            combo.clear()
+            combo.addItem("Error loading accounts", None)
+        finally:
+            combo.blockSignals(False)
+        # single notification for the new selection
+        combo.currentIndexChanged.emit(combo.currentIndex())
 
     def on_account_changed(self, idx):
         acc_num = self.account_combo.currentData()
@@ -200,10 +221,17 @@ class SwiftGUI(QtWidgets.QMainWindow):
         except Exception:
             pass
 
-    def _collect_payment(self):
+    def _on_amount_changed(self, text: str):
+        # Parsed once per edit; the validator already limits input to plain decimals
         try:
-            amount = Decimal(self.amount_edit.text().strip())
-        except Exception:
+            self._amount_decimal = Decimal(text) if text else None
+        except InvalidOperation:
+            self._amount_decimal = None  # intermediate input such as "."
+
+    def _collect_payment(self):
+        amount = self._amount_decimal
+        # hasAcceptableInput also enforces the validator's range (out-of-range text is only Intermediate)
+        if amount is None or not self.amount_edit.hasAcceptableInput():
             raise ValueError("Invalid amount (use numbers like 1234.56)")
 
         payment = payment_from_transaction(
@@ -221,31 +249,44 @@ class SwiftGUI(QtWidgets.QMainWindow):
         return payment
 
     def on_generate(self):
-        """Generate preview and automatically validate"""
+        """Generate preview and schedule automatic validation"""
         try:
             payment = self._collect_payment()
             fmt = self.format_group.checkedId()  # 0 = MT, 1 = XML
             if fmt == 0:
-                mt = generate_mt103(payment)
-                self.preview.setPlainText(mt)
-                # Auto-validate MT
-                valid, issues = validate_mt103_text(mt)
+                self.preview.setPlainText(generate_mt103(payment))
+            else:
+                self.preview.setPlainText(generate_pain001(payment))
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Error", str(e))
+            return
+        # Auto-validate once generation settles (rapid repeats coalesce into one run)
+        self._pending_format = fmt
+        self.last_validation_result = {"valid": False, "errors": []}
+        self.validation_status_label.setText("Validation status: Pending")
+        self.validation_status_label.setStyleSheet("font-weight: bold;")
+        self._validate_timer.start()
+
+    def _do_validate(self):
+        """Auto-validate the current preview; fired by the debounce timer."""
+        content = self.preview.toPlainText()
+        if not content:
+            return
+        try:
+            if self._pending_format == 0:
+                valid, issues = validate_mt103_text(content)
                 self._set_validation_result(valid, issues)
                 self.status.showMessage("MT103 preview generated and validated", 5000)
-            else:
-                xml = generate_pain001(payment)
-                self.preview.setPlainText(xml)
-                # Auto-validate XML if schema present
-                if self.schema_path:
-                    valid, errors = validate_pain001_generated(xml, self.schema_path)
-                    self._set_validation_result(valid, errors or [])
-                    if valid:
-                        self.status.showMessage("XML preview generated and validated (OK)", 5000)
-                    else:
-                        self.status.showMessage("XML preview generated (validation errors)", 8000)
+            elif self.schema_path:
+                valid, errors = self._validate_pain001(content)
+                self._set_validation_result(valid, errors or [])
+                if valid:
+                    self.status.showMessage("XML preview generated and validated (OK)", 5000)
                 else:
-                    self._set_validation_result(False, ["No pain.001 XSD selected. Please select an XSD to validate."])
-                    self.status.showMessage("XML preview generated (no schema selected)", 5000)
+                    self.status.showMessage("XML preview generated (validation errors)", 8000)
+            else:
+                self._set_validation_result(False, ["No pain.001 XSD selected. Please select an XSD to validate."])
+                self.status.showMessage("XML preview generated (no schema selected)", 5000)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", str(e))
 
@@ -265,12 +306,31 @@ class SwiftGUI(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.warning(self, "Schema required", "Please select a pain.001 XSD to validate XML.")
                 return
             try:
-                valid, errors = validate_pain001_generated(content, self.schema_path)
+                valid, errors = self._validate_pain001(content)
                 self._set_validation_result(valid, errors or [])
                 self.status.showMessage("ISO20022 validation completed", 5000)
             except SchemaNotFoundError as e:
                 QtWidgets.QMessageBox.critical(self, "Schema error", str(e))
 
+    def _on_preview_changed(self):
+        self._preview_doc = None
+
+    def _validate_pain001(self, xml: str):
+        """Validate against self.schema_path, reusing the cached parsed XSD and preview document."""
+        try:
+            schema = _cached_schema(self.schema_path, os.path.getmtime(self.schema_path))
+        except OSError as e:
+            raise SchemaNotFoundError(f"Schema file not found: {self.schema_path}") from e
+        except SchemaLoadError as e:
+            return False, [str(e)]
+        if self._preview_doc is None:
+            try:
+                self._preview_doc = parse_pain001_xml(xml)
+            except Exception:
+                # not well-formed: let the validator report it from the text
+                return validate_pain001_generated(xml, self.schema_path, schema=schema)
+        return validate_pain001_generated(self._preview_doc, self.schema_path, schema=schema)
+
     def _set_validation_result(self, valid: bool, errors: Optional[list]):
         self.last_validation_result = {"valid": valid, "errors": errors or []}
         if valid:
@@ -280,14 +340,14 @@ class SwiftGUI(QtWidgets.QMainWindow):
         else:
             self.validation_status_label.setText("Validation status: INVALID")
             self.validation_status_label.setStyleSheet("color: red; font-weight: bold;")
-            # show errors in the pane
-            text = ""
+            # show errors in the pane (built in one join; schema mismatches can yield hundreds)
             if not errors:
                 text = "Unknown validation failure."
             else:
-                for i, e in enumerate(errors, 1):
-                    text += f"{i}. {e}\n"
+                text = "\n".join(f"{i}. {e}" for i, e in enumerate(errors, 1))
+            self.validation_list.setUpdatesEnabled(False)
             self.validation_list.setPlainText(text)
+            self.validation_list.setUpdatesEnabled(True)
 
     def on_save(self):
         content = self.preview.toPlainText()
@@ -296,8 +356,7 @@ class SwiftGUI(QtWidgets.QMainWindow):
             return
         fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Message", "", "All Files (*)")
         if fname:
-            with open(fname, "w", encoding="utf-8") as f:
-                f.write(content)
+            _write_text_file(fname, content)
             self.status.showMessage(f"Saved to {fname}", 5000)
 
     def on_send(self):
@@ -327,8 +386,7 @@ class SwiftGUI(QtWidgets.QMainWindow):
             if choice == options[0]:
                 fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Message for Sending", "", "All Files (*)")
                 if fname:
-                    with open(fname, "w", encoding="utf-8") as f:
-                        f.write(content)
+                    _write_text_file(fname, content)
                     self.status.showMessage(f"Saved to {fname}", 5000)
             elif choice == options[1]:
                 self._send_via_smtp(content)
@@ -345,33 +403,88 @@ class SwiftGUI(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.critical(self, "Send error", str(e))
 
     def _send_via_smtp(self, content: str):
-        import smtplib
         host, ok1 = QtWidgets.QInputDialog.getText(self, "SMTP Server", "SMTP host (hostname:port):", text="smtp.example.com:587")
         if not ok1:
             return
         user, ok2 = QtWidgets.QInputDialog.getText(self, "SMTP User", "SMTP username:")
         if not ok2:
             return
-        passwd, ok3 = QtWidgets.QInputDialog.getText(self, "SMTP Password (will not be stored)", "Password:", QtWidgets.QLineEdit.Password)
-        if not ok3:
+        try:
+            h, p = host.split(":")
+            p = int(p)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "SMTP Error", f"Failed to send: {e}")
             return
+        key = (h, p, user)
+        passwd = None  # not needed while a session for the same server/user is open
+        if not (self._smtp and self._smtp[0] == key):
+            passwd, ok3 = QtWidgets.QInputDialog.getText(self, "SMTP Password (will not be stored)", "Password:", QtWidgets.QLineEdit.Password)
+            if not ok3:
+                return
         recipient, ok4 = QtWidgets.QInputDialog.getText(self, "Recipient", "Recipient email address:")
         if not ok4:
             return
+        self._start_send_worker("Sending email (SMTP)...",
+                                lambda: self._do_smtp(key, passwd, recipient, content),
+                                self._on_smtp_finished)
+
+    def _do_smtp(self, key: tuple, passwd: Optional[str], recipient: str, content: str):
+        """Blocking SMTP send; runs on a worker thread. Reconnects once if the kept session dropped."""
+        import smtplib
+        msg = f"Subject: SWIFT Message\n\n{content}".encode("utf-8")
+        with self._conn_lock:
+            try:
+                s = self._smtp_session(key, passwd)
+                try:
+                    s.sendmail(key[2], [recipient], msg)
+                except smtplib.SMTPServerDisconnected:
+                    self._close_smtp()
+                    if passwd is None:
+                        raise
+                    self._smtp_session(key, passwd).sendmail(key[2], [recipient], msg)
+            finally:
+                self._close_if_pending()
+
+    def _smtp_session(self, key: tuple, passwd: Optional[str]):
+        """Return the open SMTP session for (host, port, user), logging in again if it is gone."""
+        import smtplib
+        if self._smtp and self._smtp[0] == key:
+            try:
+                if self._smtp[1].noop()[0] == 250:
+                    return self._smtp[1]
+            except Exception:
+                pass
+        self._close_smtp()
+        if passwd is None:
+            raise ConnectionError("SMTP session was closed; send again to log in.")
+        host, port, user = key
+        s = smtplib.SMTP(host, port, timeout=10)
         try:
-            h, p = host.split(":")
-            p = int(p)
-            with smtplib.SMTP(h, p, timeout=10) as s:
-                s.starttls()
-                s.login(user, passwd)
-                msg = f"Subject: SWIFT Message\n\n{content}"
-                s.sendmail(user, [recipient], msg.encode("utf-8"))
+            s.starttls()
+            s.login(user, passwd)
+        except Exception:
+            s.close()
+            raise
+        self._smtp = (key, s)
+        return s
+
+    def _close_smtp(self):
+        if self._smtp:
+            try:
+                self._smtp[1].close()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def _on_smtp_finished(self, ok: bool, error: str):
+        if ok:
             QtWidgets.QMessageBox.information(self, "Email Sent", "Message sent (SMTP).")
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "SMTP Error", f"Failed to send: {e}")
+        else:
+            QtWidgets.QMessageBox.critical(self, "SMTP Error", f"Failed to send: {error}")
 
     def _send_via_sftp(self, content: str):
-        if not HAS_PARAMIKO:
+        paramiko = _load_paramiko()
+        if paramiko is None:
             QtWidgets.QMessageBox.warning(self, "Paramiko missing", "SFTP requires 'paramiko' package. Install via pip.")
             return
         host, ok1 = QtWidgets.QInputDialog.getText(self, "SFTP Host", "SFTP host (hostname):")
@@ -380,42 +493,158 @@ class SwiftGUI(QtWidgets.QMainWindow):
         port_text, ok2 = QtWidgets.QInputDialog.getText(self, "SFTP Port", "SFTP port:", text="22")
         if not ok2:
             return
+        try:
+            port = int(port_text)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "SFTP Error", f"Upload failed: {e}")
+            return
         user, ok3 = QtWidgets.QInputDialog.getText(self, "SFTP User", "SFTP username:")
         if not ok3:
             return
-        passwd, ok4 = QtWidgets.QInputDialog.getText(self, "SFTP Password", "SFTP password (not stored):", QtWidgets.QLineEdit.Password)
-        if not ok4:
-            return
+        key = (host, port, user)
+        passwd = None  # not needed while a session for the same server/user is open
+        if not (self._sftp and self._sftp[0] == key):
+            passwd, ok4 = QtWidgets.QInputDialog.getText(self, "SFTP Password", "SFTP password (not stored):", QtWidgets.QLineEdit.Password)
+            if not ok4:
+                return
         remote_path, ok5 = QtWidgets.QInputDialog.getText(self, "Remote Path", "Remote path (full filename):", text="/upload/message.txt")
         if not ok5:
             return
+        self._start_send_worker("Uploading (SFTP)...",
+                                lambda: self._do_sftp(paramiko, key, passwd, remote_path, content),
+                                self._on_sftp_finished)
+
+    def _do_sftp(self, paramiko, key: tuple, passwd: Optional[str], remote_path: str, content: str):
+        """Blocking SFTP upload; runs on a worker thread. Reconnects once if the kept session dropped."""
+        data = content.encode("utf-8")
+        with self._conn_lock:
+            try:
+                sftp = self._sftp_session(paramiko, key, passwd)
+                try:
+                    sftp.putfo(io.BytesIO(data), remote_path)
+                except Exception:
+                    if self._sftp and self._sftp[1].is_active():
+                        raise  # connection is fine; the upload itself failed
+                    self._close_sftp()
+                    if passwd is None:
+                        raise
+                    self._sftp_session(paramiko, key, passwd).putfo(io.BytesIO(data), remote_path)
+            finally:
+                self._close_if_pending()
+
+    def _sftp_session(self, paramiko, key: tuple, passwd: Optional[str]):
+        """Return the open SFTP client for (host, port, user), logging in again if it is gone."""
+        if self._sftp and self._sftp[0] == key:
+            _, transport, sftp = self._sftp
+            if transport.is_active() and not sftp.get_channel().closed:
+                return sftp
+        self._close_sftp()
+        if passwd is None:
+            raise ConnectionError("SFTP session was closed; send again to log in.")
+        host, port, user = key
+        transport = paramiko.Transport((host, port))
         try:
-            port = int(port_text)
-            transport = paramiko.Transport((host, port))
             transport.connect(username=user, password=passwd)
             sftp = paramiko.SFTPClient.from_transport(transport)
-            with tempfile.NamedTemporaryFile("w+", delete=False, encoding="utf-8") as tf:
-                tf.write(content)
-                tempname = tf.name
-            sftp.put(tempname, remote_path)
-            sftp.close()
+        except Exception:
             transport.close()
-            os.unlink(tempname)
+            raise
+        transport.set_keepalive(60)
+        self._sftp = (key, transport, sftp)
+        return sftp
+
+    def _close_sftp(self):
+        if self._sftp:
+            _, transport, sftp = self._sftp
+            try:
+                sftp.close()
+                transport.close()
+            except Exception:
+                pass
+            self._sftp = None
+
+    def _on_sftp_finished(self, ok: bool, error: str):
+        if ok:
             QtWidgets.QMessageBox.information(self, "SFTP", "Uploaded successfully (SFTP).")
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "SFTP Error", f"Upload failed: {e}")
+        else:
+            QtWidgets.QMessageBox.critical(self, "SFTP Error", f"Upload failed: {error}")
+
+    def _keepalive(self):
+        """Periodic NOOP on the kept SMTP session (SFTP uses the transport's own keepalive)."""
+        if not self._smtp:
+            return
+
+        def ping():
+            # skip this round if a send currently holds the connections
+            if not self._conn_lock.acquire(blocking=False):
+                return
+            try:
+                if self._smtp:
+                    try:
+                        self._smtp[1].noop()
+                    except Exception:
+                        self._close_smtp()
+            finally:
+                self._conn_lock.release()
+
+        QtCore.QThreadPool.globalInstance().start(Worker(ping))
+
+    def _close_if_pending(self):
+        """Called by a send, with _conn_lock held, to carry out a disconnect requested meanwhile."""
+        if self._close_pending:
+            self._close_pending = False
+            self._close_smtp()
+            self._close_sftp()
+
+    def _close_sessions(self) -> bool:
+        """
+        Close the kept SMTP / SFTP sessions without blocking the GUI thread. If a send holds
+        the connections, the close is left to that send's worker; returns False in that case.
+        """
+        self._close_pending = True
+        # never wait here: a send may sit in a network call (SFTP connect has no timeout)
+        if not self._conn_lock.acquire(blocking=False):
+            return False
+        try:
+            self._close_if_pending()
+        finally:
+            self._conn_lock.release()
+        return True
+
+    def on_disconnect(self):
+        if self._close_sessions():
+            self.status.showMessage("SMTP / SFTP sessions closed", 5000)
+        else:
+            self.status.showMessage("SMTP / SFTP sessions will close when the current send finishes", 5000)
+
+    def closeEvent(self, event):
+        self._close_sessions()
+        super().closeEvent(event)
+
+    def _start_send_worker(self, label: str, fn, on_finished):
+        """Run a blocking send on the global thread pool behind a busy dialog."""
+        progress = QtWidgets.QProgressDialog(label, None, 0, 0, self)
+        progress.setCancelButton(None)
+        progress.setWindowModality(QtCore.Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.show()
+
+        def done(ok: bool, error: str):
+            progress.close()
+            on_finished(ok, error)
+
+        worker = Worker(fn)
+        worker.signals.finished.connect(done)
+        QtCore.QThreadPool.globalInstance().start(worker)
 
     def select_schema_file(self):
         fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select pain.001 XSD", "", "XSD files (*.xsd);;All Files (*)")
         if fname:
+            _cached_schema.cache_clear()
             self.schema_path = fname
             self.schema_label.setText(os.path.basename(fname))
             self.status.showMessage(f"Schema set: {fname}", 5000)
 
-    def on_validate_clicked(self):
-        # This method is assigned above; defined to satisfy linter
-        pass
-
     def on_load_logo(self):
         # Let user choose a logo file (png/svg); copy into assets and show preview
         fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select logo file (PNG or SVG)", "", "Images (*.png *.svg);;All Files (*)")
@@ -426,11 +655,8 @@ class SwiftGUI(QtWidgets.QMainWindow):
             os.makedirs(ASSETS_DIR, exist_ok=True)
             basename = os.path.basename(fname)
             dest = os.path.join(ASSETS_DIR, basename)
-            # copy file
-            with open(fname, "rb") as rf:
-                data = rf.read()
-            with open(dest, "wb") as wf:
-                wf.write(data)
+            # copy file (kernel-side copy where the OS supports it)
+            shutil.copyfile(fname, dest)
             # update default logo path to newly copied file
             self._load_logo_preview(dest)
             self.status.showMessage(f"Logo loaded to assets/{basename}", 5000)
@@ -438,21 +664,58 @@ class SwiftGUI(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.critical(self, "Logo error", str(e))
 
     def _load_logo_preview(self, path: str):
-        # Show simple preview of PNG or SVG; fallback to text if not found
-        if not path or not os.path.exists(path):
+        # Show simple preview of PNG or SVG; fallback to text if not found.
+        # Embedded ":/assets/..." resources are checked through QFile; for files on disk
+        # one stat gives both existence and the mtime used by the caches below.
+        is_resource = bool(path) and path.startswith(":/")
+        try:
+            if is_resource:
+                if not QtCore.QFile.exists(path):
+                    raise FileNotFoundError(path)
+                version = ""
+            else:
+                version = os.stat(path).st_mtime
+        except (OSError, TypeError):
             self.logo_label.setText("No logo")
             return
+        size = self.logo_label.size()
+        # Scaled pixmaps are memoized per (file version, label size); on_load_logo may overwrite a path
+        key = f"{path}|{version}|{size.width()}x{size.height()}"
+        pixmap = QtGui.QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            self.logo_label.setPixmap(pixmap)
+            return
         ext = os.path.splitext(path)[1].lower()
         if ext == ".svg":
+            # Pre-rasterized PNG in assets/.cache skips QSvgRenderer when the SVG is unchanged
+            cache_path = os.path.join(LOGO_CACHE_DIR, os.path.basename(path) + ".png")
+            try:
+                cache_fresh = not is_resource and os.stat(cache_path).st_mtime >= version
+            except OSError:
+                cache_fresh = False
+            if cache_fresh:
+                pixmap = QtGui.QPixmap(cache_path)
+                if not pixmap.isNull():
+                    QtGui.QPixmapCache.insert(key, pixmap)
+                    self.logo_label.setPixmap(pixmap)
+                    return
             svg_widget = QtSvgWidget(path, self.logo_label.size())
             # replace existing label with svg preview by setting pixmap
             pixmap = svg_widget.render_to_pixmap(self.logo_label.size())
+            if not is_resource:
+                try:
+                    os.makedirs(LOGO_CACHE_DIR, exist_ok=True)
+                    pixmap.save(cache_path, "PNG")
+                except Exception:
+                    pass  # read-only install dir: render again next time
+            QtGui.QPixmapCache.insert(key, pixmap)
             self.logo_label.setPixmap(pixmap)
         else:
             try:
                 pixmap = QtGui.QPixmap(path)
                 if not pixmap.isNull():
-                    pixmap = pixmap.scaled(self.logo_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+                    pixmap = pixmap.scaled(size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+                    QtGui.QPixmapCache.insert(key, pixmap)
                     self.logo_label.setPixmap(pixmap)
                     return
             except Exception:
@@ -460,6 +723,35 @@ class SwiftGUI(QtWidgets.QMainWindow):
             self.logo_label.setText(os.path.basename(path))
 
 
+class WorkerSignals(QtCore.QObject):
+    """
+    Signals for Worker (QRunnable is not a QObject and cannot define signals).
+    result(return_value) on success, then finished(ok, error_message)
+    """
+    result = QtCore.pyqtSignal(object)
+    finished = QtCore.pyqtSignal(bool, str)
+
+
+class Worker(QtCore.QRunnable):
+    """
+    Run a blocking callable (backend load, SMTP / SFTP send) off the GUI thread.
+    The outcome is delivered to the GUI thread through signals.result / signals.finished.
+    """
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            value = self.fn()
+        except Exception as e:
+            self.signals.finished.emit(False, str(e))
+        else:
+            self.signals.result.emit(value)
+            self.signals.finished.emit(True, "")
+
+
 class QtSvgWidget(QtWidgets.QWidget):
     """
     Minimal helper to render an SVG to a QPixmap for preview.
@@ -468,10 +760,7 @@ class QtSvgWidget(QtWidgets.QWidget):
         super().__init__()
         self.svg_path = svg_path
         # lazy import to avoid adding PyQt5 SVG requirement unless used
-        try:
-            from PyQt5.QtSvg import QSvgRenderer
-        except Exception:
-            QSvgRenderer = None
+        QSvgRenderer = _load_svg_renderer()
         self._renderer = QSvgRenderer(svg_path) if QSvgRenderer else None
 
     def render_to_pixmap(self, size: QtCore.QSize) -> QtGui.QPixmap:
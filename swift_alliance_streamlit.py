@@ -10,31 +10,188 @@ Run:
 """
 
 import streamlit as st
-import tempfile
 import os
+import re
+import hashlib
+import queue
+import threading
+import time
 import datetime
-from decimal import Decimal, InvalidOperation
+import functools
+from decimal import Decimal
 from typing import Optional
 import io
 import shutil
 
 # Local modules (must be present in same directory)
 from swift_alliance_bank import create_bank_instance, demo  # demo() creates sample data
-from swift_messages import generate_mt103, generate_pain001, payment_from_transaction
-from swift_iso_validator import validate_pain001_generated, validate_mt103_text, SchemaNotFoundError
+from swift_messages import generate_mt103, generate_pain001_bytes, payment_from_transaction
+from swift_iso_validator import (validate_pain001_generated, validate_mt103_text, load_pain001_schema,
+                                 SchemaNotFoundError, SchemaLoadError)
 import config_manager
 
-# Optional paramiko for SFTP (only used if available)
-try:
-    import paramiko
-    HAS_PARAMIKO = True
-except Exception:
-    HAS_PARAMIKO = False
+
+@functools.lru_cache(maxsize=1)
+def _load_paramiko():
+    """Optional paramiko for SFTP, imported on first use (it pulls in cryptography); None if missing."""
+    try:
+        import paramiko
+    except Exception:
+        return None
+    return paramiko
+
 
 # Ensure assets directory exists for persistent uploads
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
 os.makedirs(ASSETS_DIR, exist_ok=True)
 
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_schema(path: str, mtime: float):
+    """Parsed pain.001 XSD, kept across reruns; keyed on mtime so an edited file is re-parsed."""
+    return load_pain001_schema(path)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_bank():
+    """
+    Bank backend, built once per server process (shared by all sessions) instead of on every rerun.
+    Call _get_bank.clear() to pick up data changed elsewhere (demo data, the CLI).
+    """
+    return create_bank_instance()
+
+
+# Input shape checks for the compose form, compiled once at import
+_IBAN_RE = re.compile(r"^[A-Z]{2}\d{2}[A-Za-z0-9]{1,30}$")  # same shape as the pain.001 IBAN type
+_BIC_RE = re.compile(r"^[A-Z]{6}[A-Z0-9]{2}([A-Z0-9]{3})?$")
+_AMOUNT_RE = re.compile(r"^\d+(\.\d{1,2})?$")
+
+# Cheap block-structure check run before the field-level MT103 validator:
+# {1:...} {2:...} [optional {3:...}] {4: ... -}
+_MT_BLOCK_RE = re.compile(r"\{1:[^}]+\}\s*\{2:[^}]+\}\s*(?:\{3:.*?\}\s*)?\{4:.*-\}", re.S)
+
+
+def _validate_mt103(mt_text: str):
+    """validate_mt103_text behind a regex prefilter that rejects broken block structure immediately."""
+    if not _MT_BLOCK_RE.search(mt_text):
+        return False, ["Malformed MT message: expected {1:}{2:}...{4:...-} block structure"]
+    return validate_mt103_text(mt_text)
+
+
+SEND_LOG_FILE = "swift_send_log.txt"
+
+
+def _drain_send_log(q: queue.Queue):
+    # Block for one entry, then take whatever else is queued and append it all in one write
+    while True:
+        batch = [q.get()]
+        while True:
+            try:
+                batch.append(q.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            with open(SEND_LOG_FILE, "a", encoding="utf-8") as f:
+                f.write("".join(f"----- {ts} -----\n{content}\n\n" for ts, content in batch))
+        except OSError as e:
+            print(f"Failed to write {SEND_LOG_FILE}: {e}")
+
+
+@st.cache_resource(show_spinner=False)
+def _send_log_queue() -> queue.Queue:
+    """(timestamp, content) queue for the mock-send log, written by one background thread per server."""
+    q = queue.Queue()
+    threading.Thread(target=_drain_send_log, args=(q,), name="send-log-writer", daemon=True).start()
+    return q
+
+
+class _ConfigFlusher:
+    """
+    Coalesces config.json writes off the script thread: update() only records the latest
+    settings, and a background thread saves them at most once per interval.
+    """
+    def __init__(self, interval: float = 1.0):
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._pending = None
+        self._wake = threading.Event()
+        threading.Thread(target=self._run, name="config-flusher", daemon=True).start()
+
+    def update(self, data: dict) -> None:
+        with self._lock:
+            self._pending = dict(data)
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                data, self._pending = self._pending, None
+            if data is not None:
+                try:
+                    config_manager.save_config(data)
+                except Exception as e:
+                    print(f"Failed to save config: {e}")
+            time.sleep(self._interval)
+
+
+@st.cache_resource(show_spinner=False)
+def _config_flusher() -> _ConfigFlusher:
+    return _ConfigFlusher()
+
+
+def _sftp_pool_key(host: str, port: int, user: str, pw: str) -> str:
+    # Hashed so the password itself is never kept in session state
+    return hashlib.sha256(f"{host}\0{port}\0{user}\0{pw}".encode("utf-8")).hexdigest()
+
+
+def _get_sftp(host: str, port: int, user: str, pw: str):
+    """Authenticated SFTP client for these credentials, reused across uploads in this session."""
+    pool = st.session_state.setdefault("_sftp_pool", {})
+    key = _sftp_pool_key(host, port, user, pw)
+    entry = pool.get(key)
+    if entry:
+        transport, sftp = entry
+        if transport.is_active():
+            return sftp
+        pool.pop(key, None)
+        transport.close()
+    paramiko = _load_paramiko()
+    transport = paramiko.Transport((host, port))
+    try:
+        transport.connect(username=user, password=pw)
+        sftp = paramiko.SFTPClient.from_transport(transport)
+    except Exception:
+        transport.close()
+        raise
+    pool[key] = (transport, sftp)
+    return sftp
+
+
+def _drop_sftp(host: str, port: int, user: str, pw: str):
+    """Close and forget the pooled connection (e.g. after a failed upload)."""
+    entry = st.session_state.get("_sftp_pool", {}).pop(_sftp_pool_key(host, port, user, pw), None)
+    if entry:
+        entry[0].close()
+
+
+def _looks_like_pain001(xml: str) -> bool:
+    """True if the pain.001 namespace appears near the start of the document (root declaration)."""
+    return b"pain.001" in xml[:4096].encode("utf-8")
+
+
+def _validate_pain001(xml, schema_path: str):
+    """validate_pain001_generated using the cached schema; same (valid, errors) result."""
+    try:
+        schema = _load_schema(schema_path, os.path.getmtime(schema_path))
+    except OSError as e:
+        raise SchemaNotFoundError(f"Schema file not found: {schema_path}") from e
+    except SchemaLoadError as e:
+        return False, [str(e)]
+    return validate_pain001_generated(xml, schema_path, schema=schema)
+
+
 st.set_page_config(page_title="Swift Alliance - Message Converter & Validator", layout="wide")
 
 st.title("Swift Alliance — Message Converter & ISO20022 Validator (Streamlit)")
@@ -50,16 +207,26 @@ if "logo_path" not in st.session_state:
 col1, col2 = st.columns([1, 2])
 
 with col1:
+    # Read session state once per rerun; the locals are updated alongside any writes below
+    _ss = st.session_state
+    schema_path = _ss.get("schema_path")
+    logo_path = _ss.get("logo_path")
+
     st.header("Backend / Accounts")
-    bank = create_bank_instance()
+    bank = _get_bank()
     if not bank.accounts:
         st.warning("No accounts found in bank data. Use the button below to create demo data or register customers in the CLI.")
     if st.button("Create demo data (adds one customer + accounts)"):
         demo()
-        bank = create_bank_instance()
+        _get_bank.clear()
+        bank = _get_bank()
         st.success("Demo data created. Refreshing accounts...")
+    if st.button("Reload accounts"):
+        # The cached backend doesn't see customers/accounts added outside this app (e.g. the CLI)
+        _get_bank.clear()
+        bank = _get_bank()
 
-    account_options = ["-- Select account --"] + sorted(list(bank.accounts.keys()))
+    account_options = ["-- Select account --"] + sorted(bank.accounts)
     selected_account = st.selectbox("Select account number", account_options)
 
     st.markdown("**Selected account details**")
@@ -67,101 +234,120 @@ with col1:
         acc = bank.accounts.get(selected_account)
         if acc:
             cust = bank.customers.get(acc.customer_id)
-            st.write(f"Account: `{acc.account_number}`")
-            st.write(f"Type: {acc.account_type.value}")
-            st.write(f"Currency: {acc.currency.value}")
-            st.write(f"Balance: {acc.balance.quantize(Decimal('0.01'))}")
+            # One element instead of five; blank-line separated so each field stays its own paragraph
+            details = (f"Account: `{acc.account_number}`\n\n"
+                       f"Type: {acc.account_type.value}\n\n"
+                       f"Currency: {acc.currency.value}\n\n"
+                       f"Balance: {acc.balance.quantize(Decimal('0.01'))}")
             if cust:
-                st.write(f"Customer: {cust.first_name} {cust.last_name} ({cust.customer_id})")
+                details += f"\n\nCustomer: {cust.first_name} {cust.last_name} ({cust.customer_id})"
+            st.markdown(details)
     st.markdown("---")
     st.header("Schema / Logo (persistent)")
 
     # Schema upload or select existing persistent schema
-    st.write("Current schema (persisted):", os.path.basename(st.session_state.get("schema_path")) if st.session_state.get("schema_path") else "None")
+    st.write("Current schema (persisted):", os.path.basename(schema_path) if schema_path else "None")
     uploaded_xsd = st.file_uploader("Upload pain.001 XSD (optional, persisted)", type=["xsd"])
-    if uploaded_xsd is not None:
+    # The uploader hands back the same file on every rerun; only write it when it is a new upload,
+    # so the file's mtime (part of the schema cache and revalidation keys) stays put
+    if uploaded_xsd is not None and _ss.get("_uploaded_xsd") != (uploaded_xsd.name, uploaded_xsd.size):
+        _ss["_uploaded_xsd"] = (uploaded_xsd.name, uploaded_xsd.size)
         # save to assets/schemas/
         schemas_dir = os.path.join(ASSETS_DIR, "schemas")
         os.makedirs(schemas_dir, exist_ok=True)
         target = os.path.join(schemas_dir, os.path.basename(uploaded_xsd.name))
         with open(target, "wb") as f:
-            f.write(uploaded_xsd.read())
-        st.session_state["schema_path"] = target
+            shutil.copyfileobj(uploaded_xsd, f, length=1024 * 1024)
+        schema_path = _ss["schema_path"] = target
         # persist config
-        config_manager.save_config({"schema_path": st.session_state["schema_path"], "logo_path": st.session_state.get("logo_path")})
+        _config_flusher().update({"schema_path": schema_path, "logo_path": logo_path})
         st.success(f"Schema uploaded and saved persistently at: {target}")
 
     # Allow choosing from persisted schemas in assets/schemas/
     schemas_dir = os.path.join(ASSETS_DIR, "schemas")
     if os.path.isdir(schemas_dir):
-        available = sorted([f for f in os.listdir(schemas_dir) if f.lower().endswith(".xsd")])
+        with os.scandir(schemas_dir) as it:
+            available = sorted(e.name for e in it if e.name.lower().endswith(".xsd"))
         if available:
             sel = st.selectbox("Choose persisted schema (assets/schemas)", ["-- keep current --"] + available)
             if sel and sel != "-- keep current --":
-                st.session_state["schema_path"] = os.path.join(schemas_dir, sel)
-                config_manager.save_config({"schema_path": st.session_state["schema_path"], "logo_path": st.session_state.get("logo_path")})
+                schema_path = _ss["schema_path"] = os.path.join(schemas_dir, sel)
+                _config_flusher().update({"schema_path": schema_path, "logo_path": logo_path})
                 st.success(f"Selected schema: {sel}")
 
     # Logo uploader (persisted to ./assets/)
-    st.write("Current logo (persisted):", os.path.basename(st.session_state.get("logo_path")) if st.session_state.get("logo_path") else "None")
+    st.write("Current logo (persisted):", os.path.basename(logo_path) if logo_path else "None")
     logo_file = st.file_uploader("Upload logo (PNG/SVG) to persist", type=["png", "svg", "jpg", "jpeg"])
     if logo_file:
         target = os.path.join(ASSETS_DIR, os.path.basename(logo_file.name))
         with open(target, "wb") as f:
-            f.write(logo_file.read())
-        st.session_state["logo_path"] = target
-        config_manager.save_config({"schema_path": st.session_state.get("schema_path"), "logo_path": st.session_state["logo_path"]})
+            shutil.copyfileobj(logo_file, f, length=1024 * 1024)
+        logo_path = _ss["logo_path"] = target
+        _config_flusher().update({"schema_path": schema_path, "logo_path": logo_path})
         st.success(f"Logo saved persistently at: {target}")
 
 with col2:
+    _ss = st.session_state
+    schema_path = _ss.get("schema_path")
+    logo_path = _ss.get("logo_path")
+
     # Show persisted logo if present
-    logo_path = st.session_state.get("logo_path")
     if logo_path and os.path.exists(logo_path):
         st.image(logo_path, width=300)
     else:
         st.markdown("*(No persisted logo — upload one in the left panel)*")
 
     st.header("Compose Payment")
-    ordering_name = st.text_input("Ordering name", value="")
-    ordering_account = st.text_input("Ordering account (IBAN)", value=(selected_account if selected_account and selected_account != "-- Select account --" else ""))
-    beneficiary_name = st.text_input("Beneficiary name", value="")
-    beneficiary_account = st.text_input("Beneficiary account (IBAN)", value="")
-    beneficiary_bic = st.text_input("Beneficiary BIC (optional)", value="")
-    col_amount1, col_amount2 = st.columns([1, 1])
-    with col_amount1:
-        amount_text = st.text_input("Amount (e.g., 1234.56)", value="0.00")
-    with col_amount2:
-        currency = st.text_input("Currency", value="USD")
-    value_date = st.text_input("Value date (YYYY-MM-DD)", value=datetime.date.today().isoformat())
-    remittance = st.text_area("Remittance information", value="")
-    reference = st.text_input("Reference (optional)", value="")
+    # Fields live in a form so typing doesn't rerun the script; one rerun on "Generate Preview"
+    with st.form("compose"):
+        ordering_name = st.text_input("Ordering name", value="")
+        ordering_account = st.text_input("Ordering account (IBAN)", value=(selected_account if selected_account and selected_account != "-- Select account --" else ""))
+        beneficiary_name = st.text_input("Beneficiary name", value="")
+        beneficiary_account = st.text_input("Beneficiary account (IBAN)", value="")
+        beneficiary_bic = st.text_input("Beneficiary BIC (optional)", value="")
+        col_amount1, col_amount2 = st.columns([1, 1])
+        with col_amount1:
+            amount_text = st.text_input("Amount (e.g., 1234.56)", value="0.00")
+        with col_amount2:
+            currency = st.text_input("Currency", value="USD")
+        value_date = st.text_input("Value date (YYYY-MM-DD)", value=datetime.date.today().isoformat())
+        remittance = st.text_area("Remittance information", value="")
+        reference = st.text_input("Reference (optional)", value="")
 
-    st.markdown("---")
-    st.write("Select message format and actions:")
+        st.markdown("---")
+        st.write("Select message format:")
 
-    fmt = st.radio("Format", ["ISO20022 pain.001 (XML)", "MT103 (text)"])
+        fmt = st.radio("Format", ["ISO20022 pain.001 (XML)", "MT103 (text)"])
 
-    # Buttons for actions
-    btn_generate = st.button("Generate Preview")
+        btn_generate = st.form_submit_button("Generate Preview")
+
+    # Buttons for actions on the generated preview
     btn_validate = st.button("Validate Current Preview")
     btn_download = st.button("Download Message")
     btn_send_mock = st.button("Send (mock) — log locally / email (optional)")
 
     # Session store for preview content and validation
-    if "preview_content" not in st.session_state:
-        st.session_state["preview_content"] = ""
-    if "validation_result" not in st.session_state:
-        st.session_state["validation_result"] = {"valid": False, "errors": []}
-    if "last_format" not in st.session_state:
-        st.session_state["last_format"] = None
+    preview = _ss.setdefault("preview_content", "")
+    last_fmt = _ss.setdefault("last_format", None)
+    _ss.setdefault("validation_result", {"valid": False, "errors": []})
 
     def _build_payment_dict():
-        # Validate amount
-        try:
-            amt = Decimal(amount_text.strip())
-        except (InvalidOperation, ValueError):
+        # Reject badly shaped input before building / generating anything
+        amount_str = amount_text.strip()
+        if not _AMOUNT_RE.match(amount_str):
             st.error("Invalid amount. Use numbers like 1234.56")
             return None
+        amt = Decimal(amount_str)
+        bic = beneficiary_bic.strip()
+        if bic and not _BIC_RE.match(bic):
+            st.error("Invalid BIC. Expected 8 or 11 characters, e.g. DEUTDEFF or DEUTDEFF500")
+            return None
+        if fmt.startswith("ISO20022"):
+            # pain.001 carries both accounts as IBANs; MT103 accounts may be free-form
+            for label, acct in (("ordering", ordering_account), ("beneficiary", beneficiary_account)):
+                if not _IBAN_RE.match(acct.strip()):
+                    st.error(f"Invalid {label} IBAN. Expected country code, check digits and account, e.g. DE89370400440532013000")
+                    return None
         return payment_from_transaction(
             account_number=ordering_account.strip(),
             account_name=ordering_name.strip(),
@@ -181,32 +367,44 @@ with col2:
         if payment is None:
             st.stop()
         if fmt.startswith("ISO20022"):
-            xml = generate_pain001(payment)
-            st.session_state["preview_content"] = xml
-            st.session_state["last_format"] = "XML"
+            xml_bytes = generate_pain001_bytes(payment)
+            # validation works on the bytes; the str is only for the preview widget
+            preview = _ss["preview_content"] = xml_bytes.decode("utf-8")
+            last_fmt = _ss["last_format"] = "XML"
             st.success("XML preview generated")
             # Auto-validate if persisted schema present
-            schema_path = st.session_state.get("schema_path")
             if schema_path and os.path.exists(schema_path):
                 try:
-                    valid, errors = validate_pain001_generated(xml, schema_path)
-                    st.session_state["validation_result"] = {"valid": valid, "errors": errors or []}
-                    if valid:
+                    # Skip re-validation when neither the submitted fields nor the schema changed since the
+                    # last run. Keyed on the form input, not the XML: the generator stamps the current time
+                    # (and random ids when no reference is given) into every document it produces.
+                    key = (schema_path, os.path.getmtime(schema_path), ordering_name, ordering_account,
+                           beneficiary_name, beneficiary_account, beneficiary_bic, amount_text, currency,
+                           value_date, remittance, reference)
+                    last = _ss.get("_last_validated")
+                    if last and last[0] == key:
+                        result = last[1]
+                    else:
+                        valid, errors = _validate_pain001(xml_bytes, schema_path)
+                        result = {"valid": valid, "errors": errors or []}
+                        _ss["_last_validated"] = (key, result)
+                    _ss["validation_result"] = result
+                    if result["valid"]:
                         st.success("XML validated: VALID")
                     else:
                         st.error("XML validation: INVALID — see details below")
                 except SchemaNotFoundError as e:
                     st.error(f"Schema error: {e}")
-                    st.session_state["validation_result"] = {"valid": False, "errors": [str(e)]}
+                    _ss["validation_result"] = {"valid": False, "errors": [str(e)]}
             else:
                 st.warning("No persisted schema selected — upload a pain.001 XSD on the left to enable validation.")
-                st.session_state["validation_result"] = {"valid": False, "errors": ["No schema uploaded for validation."]}
+                _ss["validation_result"] = {"valid": False, "errors": ["No schema uploaded for validation."]}
         else:
             mt = generate_mt103(payment)
-            st.session_state["preview_content"] = mt
-            st.session_state["last_format"] = "MT"
-            valid, issues = validate_mt103_text(mt)
-            st.session_state["validation_result"] = {"valid": valid, "errors": issues}
+            preview = _ss["preview_content"] = mt
+            last_fmt = _ss["last_format"] = "MT"
+            valid, issues = _validate_mt103(mt)
+            _ss["validation_result"] = {"valid": valid, "errors": issues}
             if valid:
                 st.success("MT103 generated and basic validation PASSED")
             else:
@@ -214,18 +412,21 @@ with col2:
 
     # Manual validate
     if btn_validate:
-        content = st.session_state.get("preview_content", "")
+        content = preview
         if not content:
             st.warning("No preview content to validate. Generate a message first.")
         else:
-            if st.session_state.get("last_format") == "XML":
-                schema_path = st.session_state.get("schema_path")
+            if last_fmt == "XML":
                 if not schema_path or not os.path.exists(schema_path):
                     st.error("No persisted schema. Upload a pain.001 XSD on the left to validate XML.")
+                elif not _looks_like_pain001(content):
+                    # Cheap namespace sniff; no point running the XSD on a non-pain.001 document
+                    _ss["validation_result"] = {"valid": False, "errors": ["Not a pain.001 document (root/namespace mismatch)"]}
+                    st.error("XML validation: INVALID")
                 else:
                     try:
-                        valid, errors = validate_pain001_generated(content, schema_path)
-                        st.session_state["validation_result"] = {"valid": valid, "errors": errors or []}
+                        valid, errors = _validate_pain001(content, schema_path)
+                        _ss["validation_result"] = {"valid": valid, "errors": errors or []}
                         if valid:
                             st.success("XML validation: VALID")
                         else:
@@ -233,8 +434,8 @@ with col2:
                     except SchemaNotFoundError as e:
                         st.error(f"Schema error: {e}")
             else:
-                valid, issues = validate_mt103_text(content)
-                st.session_state["validation_result"] = {"valid": valid, "errors": issues}
+                valid, issues = _validate_mt103(content)
+                _ss["validation_result"] = {"valid": valid, "errors": issues}
                 if valid:
                     st.success("MT103 validation: OK")
                 else:
@@ -242,14 +443,16 @@ with col2:
 
     # Show preview and validation results
     st.subheader("Preview")
-    preview = st.session_state.get("preview_content", "")
     if preview:
-        st.code(preview, language='xml' if st.session_state.get("last_format") == "XML" else 'text')
+        # Emitted on every rerun on purpose: an element the script skips is removed from the page,
+        # so the preview cannot be swapped for a placeholder when unchanged. The compose st.form
+        # is what keeps reruns (and thus re-sends of this block) rare.
+        st.code(preview, language='xml' if last_fmt == "XML" else 'text')
     else:
         st.info("No preview yet. Fill the form and click 'Generate Preview'.")
 
     st.subheader("Validation Result")
-    val = st.session_state.get("validation_result", {"valid": False, "errors": []})
+    val = _ss["validation_result"]
     if val["valid"]:
         st.success("Validation: VALID")
     else:
@@ -259,33 +462,32 @@ with col2:
         for i, e in enumerate(val["errors"], start=1):
             st.write(f"{i}. {e}")
 
-    # Download widget
+    # Download widget: only armed on the rerun triggered by "Download Message", so the
+    # message is not handed to the download button on every other rerun
     if btn_download:
-        content = st.session_state.get("preview_content", "")
+        content = preview
         if not content:
             st.warning("Nothing to download. Generate a preview first.")
         else:
-            suffix = ".xml" if st.session_state.get("last_format") == "XML" else ".txt"
+            suffix = ".xml" if last_fmt == "XML" else ".txt"
             filename = f"swift_message_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}{suffix}"
-            st.download_button("Download message", content, file_name=filename, mime="application/octet-stream")
+            st.download_button("Download message", data=io.BytesIO(content.encode("utf-8")),
+                               file_name=filename, mime="application/octet-stream")
 
     # Mock send: log or optional SMTP/SFTP
     if btn_send_mock:
-        content = st.session_state.get("preview_content", "")
+        content = preview
         if not content:
             st.warning("Nothing to send. Generate a preview first.")
         else:
             # Block by default if invalid (user can override)
-            if not st.session_state.get("validation_result", {}).get("valid", False):
+            if not val["valid"]:
                 if not st.checkbox("I understand message is invalid and want to continue sending (override)"):
                     st.stop()
             send_method = st.selectbox("Mock send method", ["Log locally", "Email (SMTP)", "Upload via SFTP (optional)"])
             if send_method == "Log locally":
-                logf = "swift_send_log.txt"
-                with open(logf, "a", encoding="utf-8") as f:
-                    f.write(f"----- {datetime.datetime.utcnow().isoformat()} -----\n")
-                    f.write(content + "\n\n")
-                st.success(f"Message logged to {logf}")
+                _send_log_queue().put((datetime.datetime.utcnow().isoformat(), content))
+                st.success(f"Message logged to {SEND_LOG_FILE}")
             elif send_method == "Email (SMTP)":
                 smtp_host = st.text_input("SMTP host (hostname:port)", value="smtp.example.com:587")
                 smtp_user = st.text_input("SMTP username")
@@ -293,19 +495,24 @@ with col2:
                 recipient = st.text_input("Recipient email")
                 if st.button("Send email now"):
                     import smtplib
+                    from email.message import EmailMessage
                     try:
                         host, port = smtp_host.split(":")
                         port = int(port)
+                        em = EmailMessage()
+                        em["Subject"] = "SWIFT Message"
+                        em["From"] = smtp_user
+                        em["To"] = recipient
+                        em.set_content(content)
                         with smtplib.SMTP(host, port, timeout=10) as s:
                             s.starttls()
                             s.login(smtp_user, smtp_pass)
-                            msg = f"Subject: SWIFT Message\n\n{content}"
-                            s.sendmail(smtp_user, [recipient], msg.encode("utf-8"))
+                            s.send_message(em)
                         st.success("Email sent (SMTP).")
                     except Exception as e:
                         st.error(f"SMTP send failed: {e}")
             else:
-                if not HAS_PARAMIKO:
+                if _load_paramiko() is None:
                     st.error("Paramiko not installed; SFTP not available.")
                 else:
                     sftp_host = st.text_input("SFTP host")
@@ -315,18 +522,11 @@ with col2:
                     remote_path = st.text_input("Remote path (full filename)", value="/upload/message.txt")
                     if st.button("Upload via SFTP now"):
                         try:
-                            transport = paramiko.Transport((sftp_host, int(sftp_port)))
-                            transport.connect(username=sftp_user, password=sftp_pass)
-                            sftp = paramiko.SFTPClient.from_transport(transport)
-                            with tempfile.NamedTemporaryFile("w+", delete=False, encoding="utf-8") as tf:
-                                tf.write(content)
-                                tmpname = tf.name
-                            sftp.put(tmpname, remote_path)
-                            sftp.close()
-                            transport.close()
-                            os.unlink(tmpname)
+                            sftp = _get_sftp(sftp_host, int(sftp_port), sftp_user, sftp_pass)
+                            sftp.putfo(io.BytesIO(content.encode("utf-8")), remote_path)
                             st.success("Uploaded via SFTP.")
                         except Exception as e:
+                            _drop_sftp(sftp_host, int(sftp_port), sftp_user, sftp_pass)
                             st.error(f"SFTP upload failed: {e}")
 
 st.markdown("---")
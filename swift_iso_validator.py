@@ -11,22 +11,50 @@ Usage:
 
 Notes:
   - This module does NOT contact any external services.
-  - It relies on xmlschema for XSD validation; xmlschema supports XML Schema 1.0.
+  - It relies on lxml (libxml2) for XSD validation, which supports XML Schema 1.0.
 """
 
 from typing import Tuple, List, Optional
-import xmlschema
-import io
 import re
-from xml.etree import ElementTree as ET
+import threading
+from lxml import etree
 
 # Exceptions
 class SchemaNotFoundError(FileNotFoundError):
     pass
 
-def validate_pain001_xml(xml_string: str, schema_path: str) -> Tuple[bool, Optional[List[str]]]:
+class SchemaLoadError(ValueError):
+    """The XSD file exists but could not be parsed."""
+    pass
+
+# XMLSchema.error_log belongs to the schema object, so a shared (cached) schema must not
+# run two validations at once.
+_VALIDATE_LOCK = threading.Lock()
+
+def _xml_parser() -> etree.XMLParser:
+    # Parsers are not thread-safe; a fresh one is cheap. No entity expansion or network access.
+    return etree.XMLParser(resolve_entities=False, no_network=True)
+
+def load_pain001_schema(schema_path: str) -> etree.XMLSchema:
+    """
+    Parse a pain.001 XSD once so callers can cache it and reuse it across validations.
+
+    Raises:
+      SchemaNotFoundError if the file cannot be read
+      SchemaLoadError if the XSD is invalid
+    """
+    try:
+        return etree.XMLSchema(etree.parse(schema_path, _xml_parser()))
+    except OSError as e:
+        raise SchemaNotFoundError(f"Schema file not found: {schema_path}") from e
+    except (etree.XMLSyntaxError, etree.XMLSchemaParseError) as e:
+        raise SchemaLoadError(f"Failed to load schema: {e}") from e
+
+def validate_pain001_xml(xml_string, schema_path: str, schema=None) -> Tuple[bool, Optional[List[str]]]:
     """
-    Validate a pain.001 XML string against the provided XSD file.
+    Validate a pain.001 XML string (or bytes, or a document from parse_pain001_xml)
+    against the provided XSD file.
+    Pass an already-parsed schema (from load_pain001_schema) to skip re-parsing the XSD.
 
     Returns:
       (is_valid, None) if valid
@@ -36,32 +64,27 @@ def validate_pain001_xml(xml_string: str, schema_path: str) -> Tuple[bool, Optio
       valid, errors = validate_pain001_xml(xml_text, "schemas/pain.001.001.03.xsd")
     """
     # Load schema
-    try:
-        schema = xmlschema.XMLSchema(schema_path)
-    except OSError as e:
-        raise SchemaNotFoundError(f"Schema file not found: {schema_path}") from e
-    except xmlschema.XMLSchemaException as e:
-        # Problem parsing XSD
-        return False, [f"Failed to load schema: {e}"]
-
-    # Validate using iter_errors to gather full diagnostics
-    errors = []
-    try:
-        for err in schema.iter_errors(xml_string):
-            # xmlschema.exceptions.XMLSchemaValidationError has .path, .reason, .position, etc.
-            pos = getattr(err, 'position', None)
-            if pos:
-                (line, col) = pos
-                errors.append(f"Line {line}, Col {col}: {err.reason}")
-            else:
-                errors.append(str(err))
-    except Exception as e:
-        # If parsing the XML itself fails, xmlschema.iter_errors can raise
-        return False, [f"Failed to parse/validate XML: {e}"]
+    if schema is None:
+        try:
+            schema = load_pain001_schema(schema_path)
+        except SchemaLoadError as e:
+            # Problem parsing XSD
+            return False, [str(e)]
+
+    if isinstance(xml_string, (str, bytes)):
+        try:
+            doc = parse_pain001_xml(xml_string)
+        except etree.XMLSyntaxError as e:
+            return False, [f"Failed to parse/validate XML: {e}"]
+    else:
+        doc = xml_string
 
-    if errors:
-        return False, errors
-    return True, None
+    # Validate with libxml2 and collect the full error log for diagnostics
+    with _VALIDATE_LOCK:
+        if schema.validate(doc):
+            return True, None
+        errors = [f"Line {err.line}, Col {err.column}: {err.message}" for err in schema.error_log]
+    return False, errors or ["Document is not valid against the schema."]
 
 
 def validate_pain001_file(xml_path: str, schema_path: str) -> Tuple[bool, Optional[List[str]]]:
@@ -74,25 +97,27 @@ def validate_pain001_file(xml_path: str, schema_path: str) -> Tuple[bool, Option
     except OSError as e:
         raise FileNotFoundError(f"XML file not found: {xml_path}") from e
 
-    # Try to decode as UTF-8 (safe for typical outputs)
-    try:
-        xml_text = xml_bytes.decode('utf-8')
-    except UnicodeDecodeError:
-        # fallback: let xmlschema handle bytes input
-        xml_text = xml_bytes
-
-    return validate_pain001_xml(xml_text, schema_path)
+    # Bytes go straight to the parser, which honours the XML encoding declaration
+    return validate_pain001_xml(xml_bytes, schema_path)
 
 
 # --- Basic MT103 structural validator (heuristic) ---
 
 _MT103_REQUIRED_TAGS = [":20:", ":32A:", ":50K:", ":59:", ":71A:"]
 
+# Tags begin with colon and end at the next line that starts with colon-tag or block end.
+# Compiled once at import for every tag the validator looks up.
+_TAG_PATTERNS = {
+    tag: re.compile(re.escape(tag) + r"(.*?)(?=\n:|$)", re.DOTALL)
+    for tag in _MT103_REQUIRED_TAGS
+}
+# :32A: content: YYMMDD<CCC><AMOUNT>
+_FIELD_32A_RE = re.compile(r"^(\d{6})([A-Z]{3})(\d+(?:\.\d{1,2})?)$")
+
 def _find_tag(mt_text: str, tag: str) -> Optional[re.Match]:
     """Return the regex match for tag content if present (simple heuristic)."""
-    # Tags begin with colon and end at the next line that starts with colon-tag or block end.
     # This is a lightweight heuristic and not a full parser.
-    pattern = re.compile(re.escape(tag) + r"(.*?)(?=\n:|$)", re.DOTALL)
+    pattern = _TAG_PATTERNS.get(tag) or re.compile(re.escape(tag) + r"(.*?)(?=\n:|$)", re.DOTALL)
     return pattern.search(mt_text)
 
 def validate_mt103_text(mt_text: str) -> Tuple[bool, List[str]]:
@@ -118,7 +143,7 @@ def validate_mt103_text(mt_text: str) -> Tuple[bool, List[str]]:
     if m:
         content = m.group(1).strip()
         # Expecting pattern: YYMMDD<CCC><AMOUNT>  e.g. 230731USD1234.56 or 230731USD1234
-        m32 = re.match(r"^(\d{6})([A-Z]{3})(\d+(?:\.\d{1,2})?)$", content)
+        m32 = _FIELD_32A_RE.match(content)
         if not m32:
             issues.append(f":32A: field has invalid format (expected YYMMDDCCCamount). Found: '{content}'")
     else:
@@ -138,18 +163,31 @@ def validate_mt103_text(mt_text: str) -> Tuple[bool, List[str]]:
 
 # --- Simple convenience wrapper to validate pain.001 generated by swift_messages ---
 
-def validate_pain001_generated(xml_string: str, schema_path: str) -> Tuple[bool, Optional[List[str]]]:
+def parse_pain001_xml(xml_string) -> etree._Element:
+    """
+    Parse pain.001 XML (str or bytes) once so it can be validated repeatedly without re-parsing.
+    Raises lxml.etree.XMLSyntaxError if the XML is not well-formed.
+    """
+    if isinstance(xml_string, str):
+        # lxml rejects str input that carries an encoding declaration
+        xml_string = xml_string.encode('utf-8')
+    return etree.fromstring(xml_string, _xml_parser())
+
+
+def validate_pain001_generated(xml, schema_path: str, schema=None) -> Tuple[bool, Optional[List[str]]]:
     """
     Convenience wrapper: ensures XML is well-formed and then validates against schema.
+    xml may be the XML text or a document already returned by parse_pain001_xml.
     Returns same tuple as validate_pain001_xml.
     """
-    # First check well-formedness
-    try:
-        ET.fromstring(xml_string)
-    except ET.ParseError as e:
-        return False, [f"XML not well-formed: {e}"]
-
-    return validate_pain001_xml(xml_string, schema_path)
+    # First check well-formedness (the parsed document is then validated directly)
+    if isinstance(xml, (str, bytes)):
+        try:
+            xml = parse_pain001_xml(xml)
+        except etree.XMLSyntaxError as e:
+            return False, [f"XML not well-formed: {e}"]
+
+    return validate_pain001_xml(xml, schema_path, schema=schema)
 
 
 # --- Example usage (for quick manual testing) ---
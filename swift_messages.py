@@ -63,6 +63,13 @@ def generate_pain001(payment: Dict) -> str:
     Generate a minimal ISO 20022 pain.001 XML (credit transfer) for a single transaction.
     This is a simplified example suitable for internal use / conversion only.
     """
+    return generate_pain001_bytes(payment).decode('utf-8')
+
+def generate_pain001_bytes(payment: Dict) -> bytes:
+    """
+    Same as generate_pain001 but returns the UTF-8 encoded XML, ready to hand to an XML
+    parser/validator without another encode.
+    """
     NS = {
         '': 'urn:iso:std:iso:20022:tech:xsd:pain.001.001.03'
     }
@@ -121,8 +128,7 @@ def generate_pain001(payment: Dict) -> str:
     # Minimal pretty printing
     import xml.dom.minidom
     dom = xml.dom.minidom.parseString(xml_str)
-    pretty = dom.toprettyxml(indent="  ", encoding='utf-8').decode('utf-8')
-    return pretty
+    return dom.toprettyxml(indent="  ", encoding='utf-8')
 
 def payment_from_transaction(account_number: str,
                              account_name: str,
@@ -0,0 +1,78 @@
+"""
+Offscreen checks for the PyQt5 GUI (no display needed).
+
+Run:
+  pytest -q test_swift_alliance_gui.py
+"""
+
+import os
+import sys
+import types
+from decimal import Decimal
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+try:
+    import swift_alliance_bank  # noqa: F401
+except ImportError:
+    # The banking backend is a separate local file; these tests never touch it
+    _bank = types.ModuleType("swift_alliance_bank")
+    _bank.create_bank_instance = lambda: types.SimpleNamespace(accounts={}, customers={})
+    sys.modules["swift_alliance_bank"] = _bank
+
+import swift_alliance_gui  # noqa: E402
+from swift_messages import generate_mt103, payment_from_transaction  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def gui(app):
+    w = swift_alliance_gui.SwiftGUI()
+    yield w
+    w.close()
+
+
+def _mt103():
+    payment = payment_from_transaction(
+        account_number="DE89370400440532013000",
+        account_name="Alice Example",
+        beneficiary_account="GB29NWBK60161331926819",
+        beneficiary_name="Bob Example",
+        amount=Decimal("1234.56"),
+        currency="EUR",
+        value_date="2024-01-31",
+        remittance_info="Invoice 42",
+        beneficiary_bic="NWBKGB2L",
+        reference="REF42",
+    )
+    return generate_mt103(payment)
+
+
+def test_validate_button_validates_preview(gui):
+    gui.rb_mt.setChecked(True)
+    gui.preview.setPlainText(_mt103())
+    gui.validation_status_label.setText("Validation status: Pending")
+
+    gui.on_validate_clicked()
+
+    assert gui.last_validation_result["valid"] is True
+    assert gui.last_validation_result["errors"] == []
+    assert gui.validation_status_label.text() == "Validation status: VALID"
+
+
+def test_validate_button_reports_invalid_preview(gui):
+    gui.rb_mt.setChecked(True)
+    gui.preview.setPlainText("not an MT103 message")
+
+    gui.on_validate_clicked()
+
+    assert gui.last_validation_result["valid"] is False
+    assert gui.last_validation_result["errors"]
+    assert gui.validation_status_label.text() == "Validation status: INVALID"